@@ -0,0 +1,108 @@
+import math
+
+# Numba is optional and not in requirements.txt, so by default the core
+# runs as plain Python; installing numba compiles it
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Counts are rounded up after scaling by CEIL_SCALE, a relative tolerance
+# of 1e-12, so that exact multiples such as 58.1 / 0.35 =
+# 166.00000000000003 are not rounded up to an extra unit
+CEIL_SCALE = 1 - 1e-12
+
+# Redundancy tier codes passed to compute_core
+REDUNDANCY_N = 0
+REDUNDANCY_N1 = 1
+REDUNDANCY_2N = 2
+
+
+# Names of the values returned by compute_core, in order
+CORE_FIELDS = (
+    'calc_total_mw', 'calc_it_mw', 'non_it_mw', 'mech_mw', 'house_mw',
+    'lv_it_pcc', 'lv_mech_mcc', 'lv_house_pcc', 'lv_total',
+    'ups_lineups', 'ups_output_buses', 'pdus_total', 'tx_count_n', 'mv_buses',
+    'voltage_additions', 'generator_additions', 'total_buses', 'redundancy_factor',
+)
+
+
+# Numeric core of the bus count model (steps 1-3). Takes only numbers so
+# it can be compiled; returns a tuple ordered as CORE_FIELDS.
+@njit(cache=True)
+def compute_core(from_it_load, load_mw, adjusted_pue, mech_fraction, cooling_mult,
+                 geo_mult, lv_bus_mw, ups_lineup, pdu_mva, transformer_mva,
+                 power_factor, mv_base, utility_incomers, voltage_levels,
+                 backup_gens, redundancy_code, expansion_factor):
+    # Step 1: Load derivation
+    if from_it_load:
+        calc_total_mw = adjusted_pue * load_mw
+        calc_it_mw = load_mw
+    else:
+        calc_total_mw = load_mw
+        calc_it_mw = load_mw / adjusted_pue
+
+    non_it_mw = calc_total_mw - calc_it_mw
+
+    mech_mw = mech_fraction * non_it_mw * cooling_mult * geo_mult
+    house_mw = non_it_mw - (mech_mw / (cooling_mult * geo_mult))
+
+    # Step 2: Base counts (N configuration)
+    lv_it_pcc = math.ceil(calc_it_mw / lv_bus_mw * CEIL_SCALE)
+    lv_mech_mcc = math.ceil(mech_mw / lv_bus_mw * CEIL_SCALE)
+    lv_house_pcc = math.ceil(house_mw / lv_bus_mw * CEIL_SCALE)
+    lv_total = lv_it_pcc + lv_mech_mcc + lv_house_pcc
+
+    ups_lineups = math.ceil(calc_it_mw / ups_lineup * CEIL_SCALE)
+    ups_output_buses = ups_lineups
+
+    pdus_total = math.ceil(calc_it_mw / pdu_mva * CEIL_SCALE)
+
+    tx_count_n = math.ceil(calc_total_mw / (transformer_mva * power_factor) * CEIL_SCALE)
+
+    mv_buses = mv_base + (utility_incomers - 1)
+
+    # Voltage level adjustments
+    voltage_additions = 0
+    if voltage_levels > 2:
+        voltage_additions = (voltage_levels - 2) * (tx_count_n + 1)
+
+    # Generator additions
+    generator_additions = backup_gens * 2  # ATS buses
+
+    # Core bus count (N configuration)
+    buses_core_n = (mv_buses + tx_count_n + lv_total +
+                   ups_output_buses + pdus_total +
+                   voltage_additions + generator_additions)
+
+    # Step 3: Redundancy adjustments
+    if redundancy_code == REDUNDANCY_N:
+        total_buses = buses_core_n * expansion_factor
+        redundancy_factor = 1.0
+    elif redundancy_code == REDUNDANCY_N1:
+        tx_count_adj = tx_count_n + 1
+        buses_adj = (mv_buses + tx_count_adj + lv_total +
+                    ups_output_buses + pdus_total +
+                    voltage_additions + generator_additions)
+        total_buses = buses_adj * expansion_factor * 1.15
+        redundancy_factor = 1.15
+    else:  # REDUNDANCY_2N
+        mv_2n = mv_buses * 2
+        tx_2n = tx_count_n * 2
+        lv_2n = lv_total * 2
+        ups_2n = ups_output_buses * 2
+        pdus_2n = pdus_total * 1.5  # Not fully duplicated
+        extras_2n = (voltage_additions + generator_additions) * 2
+
+        buses_2n = mv_2n + tx_2n + lv_2n + ups_2n + pdus_2n + extras_2n
+        total_buses = buses_2n * expansion_factor
+        redundancy_factor = 2.0
+
+    # Round final result
+    total_buses = math.ceil(total_buses * CEIL_SCALE)
+
+    return (calc_total_mw, calc_it_mw, non_it_mw, mech_mw, house_mw,
+            lv_it_pcc, lv_mech_mcc, lv_house_pcc, lv_total,
+            ups_lineups, ups_output_buses, pdus_total, tx_count_n, mv_buses,
+            voltage_additions, generator_additions, total_buses, redundancy_factor)
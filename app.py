@@ -1,10 +1,84 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import math
+import numpy as np
 from datetime import datetime
 
+from _core import (CEIL_SCALE, CORE_FIELDS, REDUNDANCY_N, REDUNDANCY_N1, REDUNDANCY_2N,
+                   compute_core)
+
+# Data center type -> (default mechanical fraction, PUE adjustment)
+DC_PROFILE = {
+    "Enterprise/Colo": (0.7, 0.0),
+    "Hyperscale": (0.75, -0.1),
+    "AI/HPC": (0.8, -0.2),  # AI/HPC often has better cooling efficiency
+}
+
+# Cooling load multipliers
+COOLING_MULT = {"Air-cooled": 1.0, "Liquid-cooled": 1.2}
+GEO_MULT = {"Temperate": 1.0, "Cold": 0.9, "Hot/Humid": 1.1}
+
+# Redundancy tier label -> compute_core redundancy code
+REDUNDANCY_CODES = {
+    "N (Base)": REDUNDANCY_N,
+    "Tier III (N+1)": REDUNDANCY_N1,
+    "Tier IV (2N)": REDUNDANCY_2N,
+}
+
+# Static page text
+HEADER_MD = "**Tool for estimating electrical bus requirements in data center power distribution systems**"
+FOOTER_MD = "\n\n".join([
+    "---",
+    "**References:** Uptime Data Center Standards, IEEE  Reliability Standards, Industry Best Practices",
+    "*Developed By Abhishek, Validate results against specific project requirements.*",
+])
+
+# Row labels for the component breakdown table
+BREAKDOWN_COMPONENTS = (
+    'MV Buses',
+    'Transformers (MV→LV)',
+    'LV IT Buses (PCC)',
+    'LV Mechanical Buses (MCC)',
+    'LV House/Aux Buses',
+    'UPS Output Buses',
+    'PDUs',
+    'Voltage Level Additions',
+    'Generator Transfer Switches',
+    'Redundancy Adjustment',
+    'Expansion Factor',
+)
+
+# Text summary export layout, filled in with str.format. The timestamp
+# header is kept separate so the body can be cached.
+SUMMARY_HEADER = """
+DATA CENTER BUS COUNT ESTIMATION REPORT
+Generated: {generated}
+"""
+SUMMARY_TEMPLATE = """
+INPUTS:
+- Starting Point: {input_type}
+- Load: {load} MW
+- PUE: {pue} (Adjusted: {adjusted_pue:.2f})
+- Data Center Type: {dc_type}
+- Redundancy: {redundancy}
+- Cooling: {cooling_type}
+- Climate: {geo_factor}
+
+RESULTS:
+- Total Estimated Buses: {total_buses:,}
+- IT Load: {calc_it_mw:.1f} MW
+- Total Load: {calc_total_mw:.1f} MW
+- Mechanical Load: {mech_mw:.1f} MW
+
+BREAKDOWN:
+- MV Buses: {mv_buses}
+- Transformers: {tx_count_n}
+- LV Buses: {lv_total}
+- UPS Buses: {ups_output_buses}
+- PDUs: {pdus_total}
+
+VALIDATION:
+{validation}
+"""
+
 # Page configuration
 st.set_page_config(
     page_title="Data Center Bus Estimator",
@@ -15,277 +89,179 @@ st.set_page_config(
 
 # Title and description
 st.title("⚡ Data Center Electrical Bus Count Estimator")
-st.markdown("**Tool for estimating electrical bus requirements in data center power distribution systems**")
+st.markdown(HEADER_MD)
 
 # Sidebar for inputs
 st.sidebar.header("📊 Configuration Parameters")
 
+# Widget keys carry a generation suffix; the reset button bumps it so
+# every widget remounts in the browser at its default value
+gen = st.session_state.setdefault("widget_gen", 0)
+
 # Toggle for input type
 input_type = st.sidebar.radio(
     "Starting Point:",
     ["IT Load (MW)", "Total Facility Load (MW)"],
-    help="Choose whether to start from critical IT load or total facility load"
+    help="Choose whether to start from critical IT load or total facility load",
+    key=f"input_type_{gen}"
 )
 
+# Data center type
+dc_type = st.sidebar.selectbox(
+    "Data Center Type",
+    ["Enterprise/Colo", "Hyperscale", "AI/HPC"],
+    help="Different types have varying infrastructure requirements",
+    key=f"dc_type_{gen}"
+)
+
+# The two controls above change which inputs are shown, so they stay
+# outside the form; the remaining inputs are grouped in a form so
+# adjusting several of them triggers a single rerun on submit
+config = st.sidebar.form("config")
+
 # Main load input
 if input_type == "IT Load (MW)":
-    it_mw = st.sidebar.number_input(
+    it_mw = config.number_input(
         "IT Load (MW)", 
         min_value=0.1, 
         max_value=100.0, 
         value=5.0, 
         step=0.1,
-        help="Critical IT load capacity (servers, storage, networking)"
+        help="Critical IT load capacity (servers, storage, networking)",
+        key=f"it_mw_{gen}"
     )
     total_mw = None
 else:
-    total_mw = st.sidebar.number_input(
+    total_mw = config.number_input(
         "Total Facility Load (MW)", 
         min_value=0.2, 
         max_value=200.0, 
         value=7.8, 
         step=0.1,
-        help="Total facility electrical load including IT and infrastructure"
+        help="Total facility electrical load including IT and infrastructure",
+        key=f"total_mw_{gen}"
     )
     it_mw = None
 
 # PUE input
-pue = st.sidebar.slider(
+pue = config.slider(
     "PUE (Power Usage Effectiveness)", 
     min_value=1.1, 
     max_value=2.0, 
     value=1.56, 
     step=0.01,
-    help="Industry average: 1.56 (Uptime Institute 2024)"
-)
-
-# Data center type
-dc_type = st.sidebar.selectbox(
-    "Data Center Type",
-    ["Enterprise/Colo", "Hyperscale", "AI/HPC"],
-    help="Different types have varying infrastructure requirements"
+    help="Industry average: 1.56 (Uptime Institute 2024)",
+    key=f"pue_{gen}"
 )
 
 # Auto-adjust defaults based on DC type
-if dc_type == "AI/HPC":
-    default_mech_frac = 0.8
-    pue_adjustment = -0.2  # AI/HPC often has better cooling efficiency
-elif dc_type == "Hyperscale":
-    default_mech_frac = 0.75
-    pue_adjustment = -0.1
-else:  # Enterprise/Colo
-    default_mech_frac = 0.7
-    pue_adjustment = 0.0
+default_mech_frac, pue_adjustment = DC_PROFILE[dc_type]
 
 # Apply PUE adjustment
 adjusted_pue = max(1.1, pue + pue_adjustment)
 
 # Non-IT load split
-mech_fraction = st.sidebar.slider(
+mech_fraction = config.slider(
     "Mechanical (Cooling) Fraction of Non-IT Load", 
     min_value=0.5, 
     max_value=0.9, 
     value=default_mech_frac, 
     step=0.01,
-    help="Percentage of non-IT load dedicated to cooling systems"
+    help="Percentage of non-IT load dedicated to cooling systems",
+    key=f"mech_fraction_{dc_type}_{gen}"
 )
 
 # Redundancy tier
-redundancy = st.sidebar.selectbox(
+redundancy = config.selectbox(
     "Redundancy Tier",
     ["N (Base)", "Tier III (N+1)", "Tier IV (2N)"],
     index=1,
-    help="Higher tiers require more redundant equipment and buses"
+    help="Higher tiers require more redundant equipment and buses",
+    key=f"redundancy_{gen}"
 )
 
 # Equipment capacities section
-st.sidebar.subheader("🔧 Equipment Block Capacities")
+config.subheader("🔧 Equipment Block Capacities")
 
-ups_lineup = st.sidebar.slider("UPS Lineup (MW)", 0.5, 2.0, 1.5, 0.1)
-transformer_mva = st.sidebar.slider("Transformer MV→LV (MVA)", 1.0, 5.0, 3.0, 0.1)
-lv_bus_mw = st.sidebar.slider("LV Switchboard Bus Section (MW)", 2.0, 4.5, 3.0, 0.1)
-pdu_mva = st.sidebar.slider("PDU Capacity (MVA)", 0.2, 0.6, 0.3, 0.05)
-mv_base = st.sidebar.slider("MV Buses Base (per system)", 1, 4, 2, 1)
+ups_lineup = config.slider("UPS Lineup (MW)", 0.5, 2.0, 1.5, 0.1, key=f"ups_lineup_{gen}")
+transformer_mva = config.slider("Transformer MV→LV (MVA)", 1.0, 5.0, 3.0, 0.1, key=f"transformer_mva_{gen}")
+lv_bus_mw = config.slider("LV Switchboard Bus Section (MW)", 2.0, 4.5, 3.0, 0.1, key=f"lv_bus_mw_{gen}")
+pdu_mva = config.slider("PDU Capacity (MVA)", 0.2, 0.6, 0.3, 0.05, key=f"pdu_mva_{gen}")
+mv_base = config.slider("MV Buses Base (per system)", 1, 4, 2, 1, key=f"mv_base_{gen}")
 
 # Additional factors
-st.sidebar.subheader("⚙️ Additional Factors")
+config.subheader("⚙️ Additional Factors")
 
-voltage_levels = st.sidebar.selectbox("Voltage Levels", [2, 3], index=0, help="2=MV+LV, 3=HV+MV+LV")
-backup_gens = st.sidebar.slider("Backup Generators", 0, 10, 0, 1)
-cooling_type = st.sidebar.selectbox("Cooling Type", ["Air-cooled", "Liquid-cooled"])
-geo_factor = st.sidebar.selectbox(
+voltage_levels = config.selectbox("Voltage Levels", [2, 3], index=0, help="2=MV+LV, 3=HV+MV+LV", key=f"voltage_levels_{gen}")
+backup_gens = config.slider("Backup Generators", 0, 10, 0, 1, key=f"backup_gens_{gen}")
+cooling_type = config.selectbox("Cooling Type", ["Air-cooled", "Liquid-cooled"], key=f"cooling_type_{gen}")
+geo_factor = config.selectbox(
     "Geographic Climate", 
     ["Temperate", "Cold", "Hot/Humid"],
-    help="Affects cooling load and PUE"
+    help="Affects cooling load and PUE",
+    key=f"geo_factor_{gen}"
 )
-expansion_factor = st.sidebar.slider("Future Expansion Factor", 1.0, 1.5, 1.0, 0.05)
-power_factor = st.sidebar.slider("Power Factor", 0.9, 1.0, 0.95, 0.01)
-utility_incomers = st.sidebar.slider("Utility Incomers", 1, 3, 1, 1)
+expansion_factor = config.slider("Future Expansion Factor", 1.0, 1.5, 1.0, 0.05, key=f"expansion_factor_{gen}")
+power_factor = config.slider("Power Factor", 0.9, 1.0, 0.95, 0.01, key=f"power_factor_{gen}")
+utility_incomers = config.slider("Utility Incomers", 1, 3, 1, 1, key=f"utility_incomers_{gen}")
+
+# Submit button
+config.form_submit_button("🧮 Recalculate")
 
-# Reset button
-if st.sidebar.button("🔄 Reset to Defaults"):
-    st.experimental_rerun()
+# Reset button: new widget keys make the button's own rerun render
+# every widget fresh, on the server and in the browser
+def reset_to_defaults():
+    st.session_state.widget_gen += 1
+
+st.sidebar.button("🔄 Reset to Defaults", on_click=reset_to_defaults)
 
 # Main calculation function
-def calculate_bus_counts():
-    results = {}
+@st.cache_data(max_entries=256, show_spinner=False)
+def calculate_bus_counts(it_mw, total_mw, adjusted_pue, mech_fraction, cooling_type,
+                         geo_factor, lv_bus_mw, ups_lineup, pdu_mva, transformer_mva,
+                         power_factor, mv_base, utility_incomers, voltage_levels,
+                         backup_gens, redundancy, expansion_factor):
     warnings = []
     
-    # Step 1: Load derivation
-    if it_mw is not None:
-        calc_total_mw = adjusted_pue * it_mw
-        calc_it_mw = it_mw
-    else:
-        calc_total_mw = total_mw
-        calc_it_mw = total_mw / adjusted_pue
-    
-    non_it_mw = calc_total_mw - calc_it_mw
-    
-    # Apply cooling type adjustment
-    cooling_multiplier = 1.0
-    if cooling_type == "Liquid-cooled":
-        cooling_multiplier = 1.2
-        
-    # Apply geographic factor
-    geo_multiplier = 1.0
-    if geo_factor == "Cold":
-        geo_multiplier = 0.9
-    elif geo_factor == "Hot/Humid":
-        geo_multiplier = 1.1
-    
-    mech_mw = mech_fraction * non_it_mw * cooling_multiplier * geo_multiplier
-    house_mw = non_it_mw - (mech_mw / (cooling_multiplier * geo_multiplier))
-    
-    # Step 2: Base counts (N configuration)
-    lv_it_pcc = math.ceil(calc_it_mw / lv_bus_mw)
-    lv_mech_mcc = math.ceil(mech_mw / lv_bus_mw)
-    lv_house_pcc = math.ceil(house_mw / lv_bus_mw)
-    lv_total = lv_it_pcc + lv_mech_mcc + lv_house_pcc
-    
-    ups_lineups = math.ceil(calc_it_mw / ups_lineup)
-    ups_output_buses = ups_lineups
+    # Apply cooling type and geographic adjustments
+    cooling_multiplier = COOLING_MULT[cooling_type]
+    geo_multiplier = GEO_MULT[geo_factor]
+    redundancy_code = REDUNDANCY_CODES[redundancy]
     
-    pdus_total = math.ceil(calc_it_mw / pdu_mva)
-    
-    tx_count_n = math.ceil(calc_total_mw / (transformer_mva * power_factor))
-    
-    mv_buses = mv_base + (utility_incomers - 1)
-    
-    # Voltage level adjustments
-    voltage_additions = 0
-    if voltage_levels > 2:
-        voltage_additions = (voltage_levels - 2) * (tx_count_n + 1)
-    
-    # Generator additions
-    generator_additions = backup_gens * 2  # ATS buses
-    
-    # Core bus count (N configuration)
-    buses_core_n = (mv_buses + tx_count_n + lv_total + 
-                   ups_output_buses + pdus_total + 
-                   voltage_additions + generator_additions)
-    
-    # Step 3: Redundancy adjustments
-    if redundancy == "N (Base)":
-        total_buses = buses_core_n * expansion_factor
-        redundancy_factor = 1.0
-    elif redundancy == "Tier III (N+1)":
-        tx_count_adj = tx_count_n + 1
-        buses_adj = (mv_buses + tx_count_adj + lv_total + 
-                    ups_output_buses + pdus_total + 
-                    voltage_additions + generator_additions)
-        total_buses = buses_adj * expansion_factor * 1.15
-        redundancy_factor = 1.15
-    else:  # Tier IV (2N)
-        mv_2n = mv_buses * 2
-        tx_2n = tx_count_n * 2
-        lv_2n = lv_total * 2
-        ups_2n = ups_output_buses * 2
-        pdus_2n = pdus_total * 1.5  # Not fully duplicated
-        extras_2n = (voltage_additions + generator_additions) * 2
-        
-        buses_2n = mv_2n + tx_2n + lv_2n + ups_2n + pdus_2n + extras_2n
-        total_buses = buses_2n * expansion_factor
-        redundancy_factor = 2.0
-    
-    # Round final result
-    total_buses = math.ceil(total_buses)
+    # Steps 1-3: numeric core
+    results = dict(zip(CORE_FIELDS, compute_core(
+        it_mw is not None, it_mw if it_mw is not None else total_mw,
+        adjusted_pue, mech_fraction, cooling_multiplier, geo_multiplier,
+        lv_bus_mw, ups_lineup, pdu_mva, transformer_mva, power_factor,
+        mv_base, utility_incomers, voltage_levels, backup_gens,
+        redundancy_code, expansion_factor
+    )))
     
     # Warnings
-    if total_buses > 500 and calc_total_mw < 20:
+    if results['total_buses'] > 500 and results['calc_total_mw'] < 20:
         warnings.append("⚠️ Bus count seems high for facility size. Review parameters.")
-    if pdus_total > 500:
+    if results['pdus_total'] > 500:
         warnings.append("⚠️ PDU count exceeds 500. Consider larger PDU blocks.")
-    if calc_it_mw / calc_total_mw < 0.3:
+    if results['calc_it_mw'] / results['calc_total_mw'] < 0.3:
         warnings.append("⚠️ IT load fraction is low. Check PUE value.")
     
-    # Store results
-    results = {
-        'calc_total_mw': calc_total_mw,
-        'calc_it_mw': calc_it_mw,
-        'non_it_mw': non_it_mw,
-        'mech_mw': mech_mw,
-        'house_mw': house_mw,
-        'lv_it_pcc': lv_it_pcc,
-        'lv_mech_mcc': lv_mech_mcc,
-        'lv_house_pcc': lv_house_pcc,
-        'lv_total': lv_total,
-        'ups_lineups': ups_lineups,
-        'ups_output_buses': ups_output_buses,
-        'pdus_total': pdus_total,
-        'tx_count_n': tx_count_n,
-        'mv_buses': mv_buses,
-        'voltage_additions': voltage_additions,
-        'generator_additions': generator_additions,
-        'total_buses': total_buses,
-        'warnings': warnings,
-        'redundancy_factor': redundancy_factor
-    }
+    results['warnings'] = warnings
     
     return results
 
-# Calculate results
-results = calculate_bus_counts()
-
-# Display results
-col1, col2 = st.columns([2, 1])
-
-with col1:
-    st.header("📊 Results Summary")
-    
-    # Key metrics
-    metric_cols = st.columns(4)
-    with metric_cols[0]:
-        st.metric("Total Buses", f"{results['total_buses']:,}")
-    with metric_cols[1]:
-        st.metric("IT Load", f"{results['calc_it_mw']:.1f} MW")
-    with metric_cols[2]:
-        st.metric("Total Load", f"{results['calc_total_mw']:.1f} MW")
-    with metric_cols[3]:
-        st.metric("Effective PUE", f"{adjusted_pue:.2f}")
-    
-    # Detailed breakdown table
-    st.subheader("🔧 Component Breakdown")
-    
-    breakdown_data = {
-        'Component': [
-            'MV Buses',
-            'Transformers (MV→LV)',
-            'LV IT Buses (PCC)',
-            'LV Mechanical Buses (MCC)',
-            'LV House/Aux Buses',
-            'UPS Output Buses',
-            'PDUs',
-            'Voltage Level Additions',
-            'Generator Transfer Switches',
-            'Redundancy Adjustment',
-            'Expansion Factor'
-        ],
+# Display data builders. The breakdown table is a handful of f-strings,
+# cheaper to rebuild than to hash and unpickle through st.cache_data;
+# st.dataframe converts it to a DataFrame either way.
+def build_breakdown_table(results, mv_base, utility_incomers, transformer_mva, lv_bus_mw,
+                          pdu_mva, voltage_levels, backup_gens, redundancy, expansion_factor):
+    return {
+        'Component': BREAKDOWN_COMPONENTS,
         'Count': [
             results['mv_buses'],
             results['tx_count_n'],
             results['lv_it_pcc'],
             results['lv_mech_mcc'],
-            math.ceil(results['house_mw'] / lv_bus_mw),
+            results['lv_house_pcc'],
             results['ups_output_buses'],
             results['pdus_total'],
             results['voltage_additions'],
@@ -307,9 +283,171 @@ with col1:
             "Future growth allowance"
         ]
     }
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def build_sensitivity(it_mw, total_mw, pue, adjusted_pue, load_label, base_load,
+                      transformer_mva, power_factor, lv_bus_mw, ups_lineup, pdu_mva,
+                      sens_fixed_buses, sens_multiplier):
+    pue_range = pue + np.array([-0.2, -0.1, 0.0, 0.1, 0.2])
+    load_range = base_load * np.array([0.5, 0.75, 1.0, 1.25, 1.5])
+    
+    if it_mw is not None:
+        pue_totals = np.maximum(pue_range, 1.1) * it_mw
+        load_totals = adjusted_pue * load_range
+    else:
+        pue_totals = np.full(pue_range.shape, total_mw)
+        load_totals = load_range
+    
+    # Simplified calculation for sensitivity. The PUE sweep holds the
+    # LV/UPS/PDU counts fixed; the load sweep re-derives them per point.
+    # Ceilings use the same tolerance as compute_core.
+    bus_counts_pue = np.ceil((pue_totals / transformer_mva * power_factor + 
+                              sens_fixed_buses) * sens_multiplier * CEIL_SCALE).astype(int)
+    bus_counts_load = np.ceil((load_totals / transformer_mva * power_factor + 
+                               np.ceil(load_range / lv_bus_mw * CEIL_SCALE) * 3 + 
+                               np.ceil(load_range / ups_lineup * CEIL_SCALE) + 
+                               np.ceil(load_range / pdu_mva * CEIL_SCALE)) * sens_multiplier * CEIL_SCALE).astype(int)
+    
+    sens_data_pue = {
+        'PUE': pue_range.tolist(),
+        'Estimated Buses': bus_counts_pue.tolist()
+    }
+    sens_data_load = {
+        load_label: load_range.tolist(),
+        'Estimated Buses': bus_counts_load.tolist()
+    }
+    return sens_data_pue, sens_data_load
+
+# Cached Plotly figure builders, keyed on hashable tuples of their inputs.
+# plotly.express is imported inside each builder so the sidebar and
+# results render before the first chart pays for the import.
+@st.cache_resource(max_entries=256, show_spinner=False)
+def make_pie(names, values):
+    import plotly.express as px
+    
+    fig_pie = px.pie(
+        values=values,
+        names=names,
+        title="Bus Distribution by Category"
+    )
+    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+    return fig_pie
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def make_bar(load_items):
+    import plotly.express as px
+    
+    load_types = [name for name, _ in load_items]
+    load_mw = [mw for _, mw in load_items]
+    
+    fig_bar = px.bar(
+        x=load_types, 
+        y=load_mw,
+        title="Load Distribution",
+        text=load_mw,
+        color=load_types,
+        labels={'x': 'Load Type', 'y': 'MW', 'text': 'MW', 'color': 'Load Type'}
+    )
+    fig_bar.update_traces(texttemplate='%{text:.1f} MW', textposition='outside')
+    return fig_bar
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def make_sens_pue(pue_range, bus_counts_pue, pue):
+    import plotly.express as px
+    
+    sens_data_pue = {
+        'PUE': pue_range,
+        'Estimated Buses': bus_counts_pue
+    }
+    
+    fig_sens_pue = px.line(sens_data_pue, x='PUE', y='Estimated Buses', 
+                          title='Bus Count vs PUE Sensitivity',
+                          markers=True)
+    fig_sens_pue.add_vline(x=pue, line_dash="dash", line_color="red", 
+                          annotation_text="Current PUE")
+    return fig_sens_pue
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def make_sens_load(load_label, load_range, bus_counts_load, base_load):
+    import plotly.express as px
+    
+    sens_data_load = {
+        load_label: load_range,
+        'Estimated Buses': bus_counts_load
+    }
     
-    df = pd.DataFrame(breakdown_data)
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    fig_sens_load = px.line(sens_data_load, x=load_label, y='Estimated Buses',
+                           title=f'Bus Count vs {load_label} Sensitivity',
+                           markers=True)
+    fig_sens_load.add_vline(x=base_load, line_dash="dash", line_color="red",
+                           annotation_text="Current Load")
+    return fig_sens_load
+
+# Cached export serializers; both return bytes for st.download_button
+@st.cache_data(max_entries=256, show_spinner=False)
+def make_csv(total_buses, calc_it_mw, calc_total_mw, adjusted_pue, redundancy, dc_type):
+    rows = [
+        ('Parameter', 'Value', 'Unit'),
+        ('Total Estimated Buses', total_buses, 'count'),
+        ('IT Load', round(calc_it_mw, 2), 'MW'),
+        ('Total Facility Load', round(calc_total_mw, 2), 'MW'),
+        ('Effective PUE', round(adjusted_pue, 2), 'ratio'),
+        ('Redundancy Level', redundancy, 'tier'),
+        ('Data Center Type', dc_type, 'category')
+    ]
+    
+    # No field contains a comma or quote, so plain joining is valid CSV
+    return "".join(",".join(str(c) for c in row) + "\n" for row in rows).encode()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def make_summary(input_type, load, pue, adjusted_pue, dc_type, redundancy,
+                 cooling_type, geo_factor, results):
+    return SUMMARY_TEMPLATE.format(
+        input_type=input_type,
+        load=load,
+        pue=pue,
+        adjusted_pue=adjusted_pue,
+        dc_type=dc_type,
+        redundancy=redundancy,
+        cooling_type=cooling_type,
+        geo_factor=geo_factor,
+        validation=chr(10).join(results['warnings']) if results['warnings'] else 'No warnings detected.',
+        **results
+    ).encode()
+
+# Calculate results
+results = calculate_bus_counts(
+    it_mw, total_mw, adjusted_pue, mech_fraction, cooling_type,
+    geo_factor, lv_bus_mw, ups_lineup, pdu_mva, transformer_mva,
+    power_factor, mv_base, utility_incomers, voltage_levels,
+    backup_gens, redundancy, expansion_factor
+)
+
+# Display results
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    st.header("📊 Results Summary")
+    
+    # Key metrics
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("Total Buses", f"{results['total_buses']:,}")
+    with metric_cols[1]:
+        st.metric("IT Load", f"{results['calc_it_mw']:.1f} MW")
+    with metric_cols[2]:
+        st.metric("Total Load", f"{results['calc_total_mw']:.1f} MW")
+    with metric_cols[3]:
+        st.metric("Effective PUE", f"{adjusted_pue:.2f}")
+    
+    # Detailed breakdown table
+    st.subheader("🔧 Component Breakdown")
+    
+    breakdown_data = build_breakdown_table(
+        results, mv_base, utility_incomers, transformer_mva, lv_bus_mw,
+        pdu_mva, voltage_levels, backup_gens, redundancy, expansion_factor
+    )
+    st.dataframe(breakdown_data, use_container_width=True, hide_index=True)
 
 with col2:
     st.header("📈 Visualization")
@@ -324,39 +462,23 @@ with col2:
         'Generators': results['generator_additions']
     }
     
-    # Filter out zero values
-    bus_categories = {k: v for k, v in bus_categories.items() if v > 0}
+    # Filter out zero values in one pass, split into hashable tuples
+    items = [(k, v) for k, v in bus_categories.items() if v > 0]
     
-    if bus_categories:
-        fig_pie = px.pie(
-            values=list(bus_categories.values()),
-            names=list(bus_categories.keys()),
-            title="Bus Distribution by Category"
-        )
-        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+    if items:
+        names, values = zip(*items)
+        fig_pie = make_pie(names, values)
         st.plotly_chart(fig_pie, use_container_width=True)
     
     # Load breakdown
     st.subheader("⚡ Load Breakdown")
     load_data = {
-        'Load Type': ['IT Load', 'Mechanical', 'House/Aux'],
-        'MW': [results['calc_it_mw'], results['mech_mw'], results['house_mw']],
-        'Percentage': [
-            results['calc_it_mw']/results['calc_total_mw']*100,
-            results['mech_mw']/results['calc_total_mw']*100,
-            results['house_mw']/results['calc_total_mw']*100
-        ]
+        'IT Load': results['calc_it_mw'],
+        'Mechanical': results['mech_mw'],
+        'House/Aux': results['house_mw']
     }
     
-    fig_bar = px.bar(
-        load_data, 
-        x='Load Type', 
-        y='MW',
-        title="Load Distribution",
-        text='MW',
-        color='Load Type'
-    )
-    fig_bar.update_traces(texttemplate='%{text:.1f} MW', textposition='outside')
+    fig_bar = make_bar(tuple(load_data.items()))
     st.plotly_chart(fig_bar, use_container_width=True)
 
 # Warnings
@@ -370,154 +492,83 @@ st.header("🎯 Sensitivity Analysis")
 
 sens_col1, sens_col2 = st.columns(2)
 
+if it_mw is not None:
+    base_load = it_mw
+    load_label = "IT Load (MW)"
+else:
+    base_load = total_mw
+    load_label = "Total Load (MW)"
+
+# Invariants shared by both sensitivity sweeps
+sens_multiplier = results['redundancy_factor'] * expansion_factor
+sens_fixed_buses = results['lv_total'] + results['ups_output_buses'] + results['pdus_total']
+
+sens_data_pue, sens_data_load = build_sensitivity(
+    it_mw, total_mw, pue, adjusted_pue, load_label, base_load,
+    transformer_mva, power_factor, lv_bus_mw, ups_lineup, pdu_mva,
+    sens_fixed_buses, sens_multiplier
+)
+
 with sens_col1:
     st.subheader("PUE Impact")
-    pue_range = [pue - 0.2, pue - 0.1, pue, pue + 0.1, pue + 0.2]
-    bus_counts_pue = []
-    
-    for test_pue in pue_range:
-        if it_mw is not None:
-            test_total = max(test_pue, 1.1) * it_mw
-        else:
-            test_total = total_mw
-        
-        # Simplified calculation for sensitivity
-        test_buses = math.ceil((test_total / transformer_mva * power_factor + 
-                              results['lv_total'] + results['ups_output_buses'] + 
-                              results['pdus_total']) * results['redundancy_factor'] * expansion_factor)
-        bus_counts_pue.append(test_buses)
-    
-    sens_df_pue = pd.DataFrame({
-        'PUE': pue_range,
-        'Estimated Buses': bus_counts_pue
-    })
-    
-    fig_sens_pue = px.line(sens_df_pue, x='PUE', y='Estimated Buses', 
-                          title='Bus Count vs PUE Sensitivity',
-                          markers=True)
-    fig_sens_pue.add_vline(x=pue, line_dash="dash", line_color="red", 
-                          annotation_text="Current PUE")
+    fig_sens_pue = make_sens_pue(
+        tuple(sens_data_pue['PUE']), tuple(sens_data_pue['Estimated Buses']), pue
+    )
     st.plotly_chart(fig_sens_pue, use_container_width=True)
 
 with sens_col2:
     st.subheader("Load Impact")
-    if it_mw is not None:
-        base_load = it_mw
-        load_label = "IT Load (MW)"
-    else:
-        base_load = total_mw
-        load_label = "Total Load (MW)"
-    
-    load_range = [base_load * 0.5, base_load * 0.75, base_load, 
-                  base_load * 1.25, base_load * 1.5]
-    bus_counts_load = []
-    
-    for test_load in load_range:
-        if it_mw is not None:
-            test_total = adjusted_pue * test_load
-        else:
-            test_total = test_load
-        
-        test_buses = math.ceil((test_total / transformer_mva * power_factor + 
-                              math.ceil(test_load / lv_bus_mw) * 3 + 
-                              math.ceil(test_load / ups_lineup) + 
-                              math.ceil(test_load / pdu_mva)) * 
-                              results['redundancy_factor'] * expansion_factor)
-        bus_counts_load.append(test_buses)
-    
-    sens_df_load = pd.DataFrame({
-        load_label: load_range,
-        'Estimated Buses': bus_counts_load
-    })
-    
-    fig_sens_load = px.line(sens_df_load, x=load_label, y='Estimated Buses',
-                           title=f'Bus Count vs {load_label} Sensitivity',
-                           markers=True)
-    fig_sens_load.add_vline(x=base_load, line_dash="dash", line_color="red",
-                           annotation_text="Current Load")
+    fig_sens_load = make_sens_load(
+        load_label, tuple(sens_data_load[load_label]),
+        tuple(sens_data_load['Estimated Buses']), base_load
+    )
     st.plotly_chart(fig_sens_load, use_container_width=True)
 
 # Export functionality
-st.header("💾 Export Results")
-
-export_col1, export_col2 = st.columns(2)
-
-with export_col1:
-    # CSV export
-    export_df = pd.DataFrame([{
-        'Parameter': 'Total Estimated Buses',
-        'Value': results['total_buses'],
-        'Unit': 'count'
-    }, {
-        'Parameter': 'IT Load',
-        'Value': round(results['calc_it_mw'], 2),
-        'Unit': 'MW'
-    }, {
-        'Parameter': 'Total Facility Load',
-        'Value': round(results['calc_total_mw'], 2),
-        'Unit': 'MW'
-    }, {
-        'Parameter': 'Effective PUE',
-        'Value': round(adjusted_pue, 2),
-        'Unit': 'ratio'
-    }, {
-        'Parameter': 'Redundancy Level',
-        'Value': redundancy,
-        'Unit': 'tier'
-    }, {
-        'Parameter': 'Data Center Type',
-        'Value': dc_type,
-        'Unit': 'category'
-    }])
-    
-    csv = export_df.to_csv(index=False)
-    st.download_button(
-        label="📄 Download CSV Report",
-        data=csv,
-        file_name=f"dc_bus_estimate_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-        mime="text/csv"
-    )
-
-with export_col2:
-    # Summary text export
-    summary_text = f"""
-DATA CENTER BUS COUNT ESTIMATION REPORT
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-INPUTS:
-- Starting Point: {input_type}
-- Load: {it_mw if it_mw else total_mw} MW
-- PUE: {pue} (Adjusted: {adjusted_pue:.2f})
-- Data Center Type: {dc_type}
-- Redundancy: {redundancy}
-- Cooling: {cooling_type}
-- Climate: {geo_factor}
-
-RESULTS:
-- Total Estimated Buses: {results['total_buses']:,}
-- IT Load: {results['calc_it_mw']:.1f} MW
-- Total Load: {results['calc_total_mw']:.1f} MW
-- Mechanical Load: {results['mech_mw']:.1f} MW
+# Runs as a fragment so clicking a download button reruns only this section
+@st.fragment
+def render_exports(results, input_type, load, pue, adjusted_pue, dc_type, redundancy,
+                   cooling_type, geo_factor):
+    st.header("💾 Export Results")
+
+    # One timestamp for both file names and the summary header
+    now = datetime.now()
+    ts_file = now.strftime('%Y%m%d_%H%M')
+    ts_disp = now.strftime('%Y-%m-%d %H:%M:%S')
+
+    export_col1, export_col2 = st.columns(2)
+
+    with export_col1:
+        # CSV export
+        csv = make_csv(
+            results['total_buses'], results['calc_it_mw'], results['calc_total_mw'],
+            adjusted_pue, redundancy, dc_type
+        )
+        st.download_button(
+            label="📄 Download CSV Report",
+            data=csv,
+            file_name=f"dc_bus_estimate_{ts_file}.csv",
+            mime="text/csv"
+        )
 
-BREAKDOWN:
-- MV Buses: {results['mv_buses']}
-- Transformers: {results['tx_count_n']}
-- LV Buses: {results['lv_total']}
-- UPS Buses: {results['ups_output_buses']}
-- PDUs: {results['pdus_total']}
+    with export_col2:
+        # Summary text export
+        summary_text = SUMMARY_HEADER.format(generated=ts_disp).encode() + make_summary(
+            input_type, load, pue, adjusted_pue, dc_type, redundancy,
+            cooling_type, geo_factor, results
+        )
+        
+        st.download_button(
+            label="📋 Download Text Summary",
+            data=summary_text,
+            file_name=f"dc_bus_summary_{ts_file}.txt",
+            mime="text/plain"
+        )
 
-VALIDATION:
-{chr(10).join(results['warnings']) if results['warnings'] else 'No warnings detected.'}
-"""
-    
-    st.download_button(
-        label="📋 Download Text Summary",
-        data=summary_text,
-        file_name=f"dc_bus_summary_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
-        mime="text/plain"
-    )
+render_exports(
+    results, input_type, it_mw if it_mw else total_mw, pue, adjusted_pue,
+    dc_type, redundancy, cooling_type, geo_factor
+)
 
 # Footer
-st.markdown("---")
-st.markdown("**References:** Uptime Data Center Standards, IEEE  Reliability Standards, Industry Best Practices")
-st.markdown("*Developed By Abhishek, Validate results against specific project requirements.*")
+st.markdown(FOOTER_MD)